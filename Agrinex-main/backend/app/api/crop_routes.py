@@ -1,50 +1,47 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any
-from app.services.crop_service import predict_crop  # your existing service
-from app.services.appwrite_service import appwrite_service
-
-router = APIRouter(prefix="/crop", tags=["crop"])
-
-class CropRequest(BaseModel):
-    crop_name: str
-    soil_type: str = "loamy"
-    farm_id: str = None  # NEW - optional farm_id
-    state_name: str
-    district_name: str
-
-@router.post("/predict")
-async def crop_predict(request: CropRequest) -> Dict[str, Any]:
-    try:
-        # Get prediction (your existing logic)
-        result = predict_crop(
-            crop_name=request.crop_name,
-            soil_type=request.soil_type,
-            state_name=request.state_name,
-            district_name=request.district_name
-        )
-        
-        # Add location and farm_id to response
-        result.update({
-            "state": request.state_name.lower(),
-            "district": request.district_name.lower(),
-            "farm_id": request.farm_id
-        })
-        
-        # Log to Appwrite
-        if result["success"]:
-            log_data = {
-                **{k: v for k, v in result.items() if k not in ["success", "error"]},
-                "crop_name": request.crop_name,
-                "soil_type": request.soil_type
-            }
-            appwrite_service.log_crop_prediction(
-                user_id="temp_user_123",  # from auth later
-                farm_id=request.farm_id or "no_farm",
-                pred_data=log_data
-            )
-        
-        return result
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks
+
+from app.core.appwrite import appwrite_service
+from app.schemas.crop import CropRequest
+from app.services.crop_service import CropService
+
+router = APIRouter(prefix="/api/v1/crop", tags=["crop"])
+
+
+@router.post("/recommend")
+async def crop_recommend(req: CropRequest, background_tasks: BackgroundTasks):
+    """
+    Recommend suitable crops based on soil type, fertility, and location weather.
+
+    Example:
+    {
+        "soil_type": "Loam",
+        "soil_quality": "Medium",
+        "state_name": "Chhattisgarh",
+        "district_name": "Durg"
+    }
+    """
+    result = await CropService.recommend_crops(
+        soil_type=req.soil_type,
+        soil_quality=req.soil_quality,
+        state_name=req.state_name,
+        district_name=req.district_name,
+    )
+    # Log to Appwrite after the response is sent - the client shouldn't
+    # wait on the DB write
+    background_tasks.add_task(appwrite_service.log_crop_prediction, "temp_user", "no_farm", result)
+    return result
+
+
+@router.post("/recommend/batch")
+async def crop_recommend_batch(reqs: List[CropRequest], background_tasks: BackgroundTasks):
+    """
+    Recommend crops for many (soil, location) combinations in one call.
+    All weather lookups run concurrently and the model scores the whole
+    batch with a single predict_proba pass.
+    """
+    results = await CropService.recommend_crops_batch([r.model_dump() for r in reqs])
+    for result in results:
+        background_tasks.add_task(appwrite_service.log_crop_prediction, "temp_user", "no_farm", result)
+    return {"results": results}
@@ -1,8 +1,8 @@
 from fastapi import APIRouter
 from pydantic import BaseModel
-from app.services.appwrite_service import appwrite_service
+from app.core.appwrite import appwrite_service
 
-router = APIRouter(prefix="/farms")
+router = APIRouter(prefix="/api/v1/farms", tags=["farms"])
 
 class FarmCreate(BaseModel):
     farm_name: str
@@ -16,10 +16,10 @@ class FarmCreate(BaseModel):
 
 @router.post("/")
 async def create_farm(farm: FarmCreate, user_id: str = "temp_user_123"):
-    farm_id = appwrite_service.create_farm(user_id, farm.dict())
+    farm_id = await appwrite_service.create_farm(user_id, farm.model_dump())
     return {"success": True, "farm_id": farm_id}
 
 @router.get("/{user_id}")
 async def list_farms(user_id: str):
-    farms = appwrite_service.list_farms(user_id)
-    return {"success": True, "farms": [f.data for f in farms]}
+    farms = await appwrite_service.list_farms(user_id)
+    return {"success": True, "farms": farms}
@@ -1,19 +1,32 @@
-from pydantic import BaseModel
+from fastapi import APIRouter, BackgroundTasks
+
+from app.core.appwrite import appwrite_service
+from app.schemas.irrigation import IrrigationRequest
+from app.services.irrigation_service import recommend_irrigation_with_weather
+
+router = APIRouter(prefix="/api/v1/irrigation", tags=["irrigation"])
 
-class IrrigationRequest(BaseModel):
-    soil_feel: str
-    application_rate: float
-    farm_id: str = None  # NEW - optional farm_id
 
 @router.post("/recommend")
-async def irrigation_recommend(request: IrrigationRequest):
-    # ... your existing logic ...
-    
-    # Log with farm_id if provided
-    if result["success"]:
-        appwrite_service.log_irrigation(
-            user_id="temp_user_123",  # from auth later
-            farm_id=request.farm_id or "no_farm",
-            log_data=result
-        )
+async def irrigation_recommend(req: IrrigationRequest, background_tasks: BackgroundTasks):
+    """
+    Recommend irrigation schedule: whether to irrigate and how much water.
+    Uses soil feel + forecast rain to decide.
+
+    Example:
+    {
+        "soil_feel": "Slightly Damp",
+        "application_rate": 5.0,
+        "state_name": "Chhattisgarh",
+        "district_name": "Durg"
+    }
+    """
+    result = await recommend_irrigation_with_weather(
+        soil_feel=req.soil_feel,
+        application_rate_mm_per_h=req.application_rate,
+        state_name=req.state_name,
+        district_name=req.district_name,
+    )
+    # Log to Appwrite in the background
+    background_tasks.add_task(appwrite_service.log_irrigation, "temp_user", req.farm_id or "no_farm", result)
     return result
@@ -0,0 +1,177 @@
+import asyncio
+
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi import APIRouter, HTTPException, Query
+
+from app.schemas.weather import CurrentWeatherOut, ForecastOut
+
+router = APIRouter(prefix="/api/v1/weather", tags=["weather"])
+
+WEATHER_API_KEY = "985cb1efea8c4871ab5125147252312"
+WEATHER_BASE = "https://api.weatherapi.com/v1"
+
+# One shared client for all outbound weather calls - pools connections and
+# reuses keep-alive instead of paying a TCP+TLS handshake per request
+HTTP_CLIENT = httpx.AsyncClient(
+    base_url=WEATHER_BASE,
+    params={"key": WEATHER_API_KEY},  # sent with every request
+    # WeatherAPI is behind Cloudflare, which speaks h2 - parallel
+    # geocode/current/forecast calls multiplex over one connection
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+)
+
+# TTL caches for weather responses (10 min) - repeated queries from the
+# same farm area serve from memory instead of hitting WeatherAPI again.
+# Coords are rounded to 2 decimals (~1 km) so nearby points share entries.
+_current_cache = TTLCache(maxsize=10_000, ttl=600)
+_forecast_cache = TTLCache(maxsize=10_000, ttl=600)
+# Geocode results rarely change - cache for 24h so typeahead traffic
+# collapses to one upstream call per unique query
+_geocode_cache = TTLCache(maxsize=50_000, ttl=86400)
+# Striped locks so concurrent misses for the same key trigger one upstream
+# call. A fixed pool instead of a per-key dict: geocode sees a new key per
+# keystroke, which would leave a Lock behind for every string ever queried.
+# Two keys sharing a stripe just means one harmless extra wait.
+_LOCK_COUNT = 256
+_cache_locks = [asyncio.Lock() for _ in range(_LOCK_COUNT)]
+
+
+def _lock_for(key) -> asyncio.Lock:
+    return _cache_locks[hash(key) % _LOCK_COUNT]
+
+
+async def close_http_client():
+    """Close the pooled client (call from app shutdown)."""
+    await HTTP_CLIENT.aclose()
+
+
+@router.get("/geocode")
+async def geocode(q: str):
+    """Search for locations by name and return coordinates"""
+    cache_key = q.lower().strip()
+    if cache_key in _geocode_cache:
+        return _geocode_cache[cache_key]
+
+    async with _lock_for(cache_key):
+        if cache_key in _geocode_cache:
+            return _geocode_cache[cache_key]
+
+        # params= also urlencodes q properly instead of pasting raw user input
+        res = await HTTP_CLIENT.get("/search.json", params={"q": q})
+        # orjson parses the raw bytes directly - no str decode, C-speed parse
+        data = orjson.loads(res.content)
+
+    results = []
+    for loc in data:
+        results.append({
+            "name": loc.get("name", ""),
+            "region": loc.get("region", ""),
+            "country": loc.get("country", ""),
+            "lat": loc.get("lat", 0),
+            "lon": loc.get("lon", 0)
+        })
+
+    result = {"results": results}
+    _geocode_cache[cache_key] = result
+    return result
+
+
+# response_model is deliberately omitted on the weather endpoints: the
+# data comes from a trusted upstream already, and re-validating every
+# field through Pydantic on each request is pure CPU overhead. The
+# schema classes are kept for the OpenAPI docs via responses=.
+@router.get("/current", responses={200: {"model": CurrentWeatherOut}})
+async def get_current_weather(lat: float, lon: float):
+    """Get current weather for given coordinates with sunrise/sunset"""
+    cache_key = ("current", round(lat, 2), round(lon, 2))
+    if cache_key in _current_cache:
+        return _current_cache[cache_key]
+
+    async with _lock_for(cache_key):
+        # Re-check after acquiring the lock - another request may have filled it
+        if cache_key in _current_cache:
+            return _current_cache[cache_key]
+
+        # Fetch both current and forecast (for sunrise/sunset).
+        # Both calls are independent - fire them concurrently so the
+        # endpoint waits max(t1, t2) instead of t1 + t2
+        current_res, forecast_res = await asyncio.gather(
+            HTTP_CLIENT.get("/current.json", params={"q": f"{lat},{lon}"}),
+            HTTP_CLIENT.get("/forecast.json", params={"q": f"{lat},{lon}", "days": 1}),
+        )
+
+    if current_res.status_code != 200:
+        raise HTTPException(status_code=current_res.status_code, detail="Weather API error")
+
+    current_data = orjson.loads(current_res.content)
+    forecast_data = orjson.loads(forecast_res.content)
+
+    loc = current_data["location"]
+    curr = current_data["current"]
+
+    # Get sunrise/sunset from forecast
+    astro = forecast_data["forecast"]["forecastday"][0]["astro"]
+    day_data = forecast_data["forecast"]["forecastday"][0]["day"]
+
+    result = {
+        "location": f"{loc['name']}, {loc['region']}, {loc['country']}",
+        "coordinates": {"lat": loc["lat"], "lon": loc["lon"]},
+        "temperature": curr["temp_c"],
+        "feelsLike": curr["feelslike_c"],
+        "condition": curr["condition"]["text"],
+        "humidity": curr["humidity"],
+        "windSpeed": curr["wind_kph"],
+        "windDirection": curr["wind_degree"],
+        "pressure": curr["pressure_mb"],
+        "visibility": curr["vis_km"],
+        "uvIndex": curr["uv"],
+        "precipMm": curr.get("precip_mm", 0),  # Current precipitation
+        "rainChance": day_data.get("daily_chance_of_rain", 0),  # Today's rain chance
+        "sunrise": astro["sunrise"],
+        "sunset": astro["sunset"],
+        "lastUpdated": curr["last_updated"],
+    }
+    # Cache the constructed response object so hits skip re-parsing entirely
+    _current_cache[cache_key] = result
+    return result
+
+
+@router.get("/forecast", responses={200: {"model": ForecastOut}})
+async def get_forecast(lat: float, lon: float, days: int = Query(7, ge=1, le=14)):
+    """Get weather forecast for given coordinates"""
+    cache_key = ("forecast", round(lat, 2), round(lon, 2), days)
+    if cache_key in _forecast_cache:
+        return _forecast_cache[cache_key]
+
+    async with _lock_for(cache_key):
+        if cache_key in _forecast_cache:
+            return _forecast_cache[cache_key]
+
+        res = await HTTP_CLIENT.get("/forecast.json", params={"q": f"{lat},{lon}", "days": days})
+
+    if res.status_code != 200:
+        raise HTTPException(status_code=res.status_code, detail="Weather API error")
+
+    data = orjson.loads(res.content)
+    forecast_days = []
+
+    for day in data["forecast"]["forecastday"]:
+        forecast_days.append({
+            "date": day["date"],
+            "high": day["day"]["maxtemp_c"],
+            "low": day["day"]["mintemp_c"],
+            "condition": day["day"]["condition"]["text"],
+            "rainChance": day["day"]["daily_chance_of_rain"],
+            "rainAmount": day["day"].get("totalprecip_mm", 0),
+            "humidity": day["day"]["avghumidity"],
+            "windSpeed": day["day"]["maxwind_kph"],
+            "isToday": (day["date"] == data["forecast"]["forecastday"][0]["date"]),
+        })
+
+    result = {"days": forecast_days}
+    _forecast_cache[cache_key] = result
+    return result
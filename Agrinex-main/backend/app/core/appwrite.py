@@ -1,80 +1,157 @@
-from appwrite.client import Client
-from appwrite.services.databases import Databases
+import asyncio
+import logging
+import logging.handlers
+import queue
+
+import httpx
+from appwrite.query import Query
 from app.core.config import settings
 
-client = (Client()
-    .set_endpoint(settings.APPWRITE_ENDPOINT)
-    .set_project(settings.APPWRITE_PROJECT_ID)
-    .set_key(settings.APPWRITE_API_KEY)
+# Async REST client for Appwrite - the official SDK is blocking, which
+# parks the event loop on every call under async FastAPI routes
+APPWRITE_CLIENT = httpx.AsyncClient(
+    base_url=settings.APPWRITE_ENDPOINT,
+    headers={
+        "X-Appwrite-Project": settings.APPWRITE_PROJECT_ID,
+        "X-Appwrite-Key": settings.APPWRITE_API_KEY,
+        "Content-Type": "application/json",
+    },
+    timeout=10.0,
+    limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
 )
 
+# Error logging goes through a QueueHandler so the request path never
+# blocks on stdio - a QueueListener thread does the actual writing
+_log_queue = queue.Queue(-1)
+_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_listener.start()
+
+logger = logging.getLogger("appwrite")
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.setLevel(logging.INFO)
+
+# Single Appwrite database + collection ids, hoisted so request paths
+# don't re-materialize the literals on every call
+DB_ID = "database-693c561e001f0c948b76"
+COLL_PROFILES = "user_details"
+COLL_FARMS = "farms"
+COLL_IRRIGATION_LOGS = "irrigation_logs"
+COLL_CROP_PREDICTIONS = "crop_prediction"
+
+# Flush the log queue when this many items are pending, or after this
+# many seconds - whichever comes first
+FLUSH_BATCH_SIZE = 50
+FLUSH_INTERVAL_S = 0.2
+
 class AppwriteService:
     def __init__(self):
-        self.databases = Databases(client)
-    
-    def create_user_profile(self, user_id: str, profile: dict):
+        # Bounded so a dead Appwrite can't grow memory without limit
+        self._queue = asyncio.Queue(maxsize=10_000)
+        self._worker = None
+
+    def start_worker(self):
+        """Start the background flush loop (call from app startup)."""
+        if self._worker is None:
+            self._worker = asyncio.get_event_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        """Drain queued log writes in batches instead of one HTTPS call each."""
+        loop = asyncio.get_event_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + FLUSH_INTERVAL_S
+            while len(batch) < FLUSH_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            results = await asyncio.gather(
+                *(self._create_document(collection_id, 'unique()', data)
+                  for collection_id, data in batch),
+                return_exceptions=True,
+            )
+            # A failed write is a dropped document - say so instead of
+            # letting return_exceptions swallow it silently
+            for (collection_id, _), res in zip(batch, results):
+                if isinstance(res, Exception):
+                    logger.error(
+                        "log write to %s failed: %s", collection_id, res
+                    )
+
+    async def _create_document(self, collection_id: str, document_id: str, data: dict):
+        res = await APPWRITE_CLIENT.post(
+            f"/databases/{DB_ID}/collections/{collection_id}/documents",
+            json={"documentId": document_id, "data": data},
+        )
+        res.raise_for_status()
+        return res.json()
+
+    async def create_user_profile(self, user_id: str, profile: dict):
         """Save/update user profile"""
         try:
-            self.databases.create_document(
-                database_id='database-693c561e001f0c948b76',
-                collection_id='user_details',
-                document_id=user_id,
-                data=profile
+            await self._create_document(COLL_PROFILES, user_id, profile)
+        except Exception as e:
+            logger.exception("create_user_profile failed user_id=%s", user_id)
+
+    async def get_user_profile(self, user_id: str):
+        """Get user profile"""
+        try:
+            res = await APPWRITE_CLIENT.get(
+                f"/databases/{DB_ID}/collections/{COLL_PROFILES}/documents/{user_id}"
             )
+            res.raise_for_status()
+            return res.json()
         except Exception as e:
-            print(f"Error creating user profile: {e}")
-    
-    def create_farm(self, user_id: str, farm_data: dict):
+            logger.exception("get_user_profile failed user_id=%s", user_id)
+            return None
+
+    async def create_farm(self, user_id: str, farm_data: dict):
         """Create new farm"""
         farm_data['user_id'] = user_id
         try:
-            return self.databases.create_document(
-                database_id='database-693c561e001f0c948b76',
-                collection_id='farms',
-                document_id='unique()',
-                data=farm_data
-            )
+            return await self._create_document(COLL_FARMS, 'unique()', farm_data)
         except Exception as e:
-            print(f"Error creating farm: {e}")
+            logger.exception("create_farm failed user_id=%s", user_id)
             return None
-    
-    def list_farms(self, user_id: str):
+
+    # Only the fields the farm UI actually renders - projecting server-side
+    # cuts response size and JSON-decode time on every /farms call
+    FARM_FIELDS = ["$id", "farm_name", "district", "state", "latitude",
+                   "longitude", "area_acres", "current_crop"]
+
+    async def list_farms(self, user_id: str):
         """Get user's farms"""
         try:
-            result = self.databases.list_documents(
-                database_id='database-693c561e001f0c948b76',
-                collection_id='farms',
-                queries=[f'equal("user_id", "{user_id}")']
+            res = await APPWRITE_CLIENT.get(
+                f"/databases/{DB_ID}/collections/{COLL_FARMS}/documents",
+                params=[
+                    ("queries[]", Query.equal("user_id", user_id)),
+                    ("queries[]", Query.select(self.FARM_FIELDS)),
+                    # Newest first, ordered server-side - the UI would
+                    # otherwise sort the list itself
+                    ("queries[]", Query.order_desc("$createdAt")),
+                    ("queries[]", Query.limit(100)),
+                ],
             )
-            return result.get('documents', [])
+            res.raise_for_status()
+            return res.json().get('documents', [])
         except Exception as e:
-            print(f"Error listing farms: {e}")
+            logger.exception("list_farms failed user_id=%s", user_id)
             return []
-    
-    def log_irrigation(self, user_id: str, farm_id: str, log_data: dict):
-        """Log irrigation decision"""
-        log_data.update({'user_id': user_id, 'farm_id': farm_id})
-        try:
-            self.databases.create_document(
-                database_id='database-693c561e001f0c948b76',
-                collection_id='irrigation_logs',
-                document_id='unique()',
-                data=log_data
-            )
-        except Exception as e:
-            print(f"Error logging irrigation: {e}")
-    
-    def log_crop_prediction(self, user_id: str, farm_id: str, pred_data: dict):
-        """Log crop prediction"""
-        pred_data.update({'user_id': user_id, 'farm_id': farm_id})
-        try:
-            self.databases.create_document(
-                database_id='database-693c561e001f0c948b76',
-                collection_id='crop_prediction',
-                document_id='unique()',
-                data=pred_data
-            )
-        except Exception as e:
-            print(f"Error logging crop prediction: {e}")
+
+    async def log_irrigation(self, user_id: str, farm_id: str, log_data: dict):
+        """Queue an irrigation log for the batched background writer"""
+        # Copy, don't mutate: the caller's dict is the cached/live
+        # response object, and queued entries must not alias it either
+        data = {**log_data, 'user_id': user_id, 'farm_id': farm_id}
+        await self._queue.put((COLL_IRRIGATION_LOGS, data))
+
+    async def log_crop_prediction(self, user_id: str, farm_id: str, pred_data: dict):
+        """Queue a crop prediction log for the batched background writer"""
+        data = {**pred_data, 'user_id': user_id, 'farm_id': farm_id}
+        await self._queue.put((COLL_CROP_PREDICTIONS, data))
 
 appwrite_service = AppwriteService()
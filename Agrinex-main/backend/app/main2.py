@@ -1,16 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import httpx
+import numpy as np
+import orjson
+from cachetools import TTLCache
 from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 
 from services.crop_service import CropService
 from services.irrigation_service import recommend_irrigation_with_weather
-app = FastAPI(title="Agrinex Weather API")
 
 WEATHER_API_KEY = "4797b38d80ea463a9b9123633251212"
 WEATHER_BASE = "https://api.weatherapi.com/v1"
 
+# One long-lived client shared by every endpoint - connections to
+# api.weatherapi.com stay pooled with keep-alive, and h2 lets parallel
+# requests multiplex over a single TLS session
+HTTP_CLIENT = httpx.AsyncClient(
+    base_url=WEATHER_BASE,
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+)
+
+
+# Current/forecast data is valid for minutes - identical (lat, lon)
+# queries within the TTL are served from memory
+_current_cache = TTLCache(maxsize=10_000, ttl=300)
+_forecast_cache = TTLCache(maxsize=10_000, ttl=300)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await HTTP_CLIENT.aclose()
+
+
+# orjson on both sides of the wire: upstream payloads are decoded with
+# orjson.loads below, and responses are serialized with ORJSONResponse
+app = FastAPI(
+    title="Agrinex Weather API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
 
 # ---------------------------------------------------------
 # -------------------- SCHEMAS ---------------------------
@@ -87,33 +124,31 @@ async def geocode(q: str):
     """
     Convert place name to lat/lon using WeatherAPI search.
     """
-    url = f"{WEATHER_BASE}/search.json?key={WEATHER_API_KEY}&q={q}"
+    url = f"/search.json?key={WEATHER_API_KEY}&q={q}"
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url)
-    
-    data = res.json()
+    res = await HTTP_CLIENT.get(url)
+
+    data = orjson.loads(res.content)
 
     if not data:
         raise HTTPException(status_code=404, detail="Location not found")
 
-    # Return unique results (WeatherAPI sometimes repeats cities)
-    unique = {}
+    # Return unique results (WeatherAPI sometimes repeats cities) -
+    # one pass over a seen-set, no intermediate dict of full items
+    seen = set()
+    final = []
     for item in data:
         key = (item["name"], item["region"], item["country"])
-        if key not in unique:
-            unique[key] = item
-
-    final = [
-        {
-            "name": v["name"],
-            "region": v["region"],
-            "country": v["country"],
-            "lat": v["lat"],
-            "lon": v["lon"]
-        }
-        for v in unique.values()
-    ]
+        if key in seen:
+            continue
+        seen.add(key)
+        final.append({
+            "name": item["name"],
+            "region": item["region"],
+            "country": item["country"],
+            "lat": item["lat"],
+            "lon": item["lon"]
+        })
 
     return {"results": final}
 
@@ -123,27 +158,29 @@ async def get_current_weather(lat: float, lon: float):
     """
     Current weather from WeatherAPI.
     """
-    url = f"{WEATHER_BASE}/current.json?key={WEATHER_API_KEY}&q={lat},{lon}&aqi=no"
+    cache_key = (round(lat, 2), round(lon, 2))
+    if cache_key in _current_cache:
+        return _current_cache[cache_key]
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url)
+    # One forecast.json call carries current conditions AND today's
+    # astro block, so the separate current.json + astronomy.json pair
+    # collapses into a single upstream round trip
+    url = f"/forecast.json?key={WEATHER_API_KEY}&q={lat},{lon}&days=1&aqi=no&alerts=no"
+
+    res = await HTTP_CLIENT.get(url)
 
     if res.status_code != 200:
         raise HTTPException(500, "Weather API error")
 
-    data = res.json()
+    data = orjson.loads(res.content)
 
     loc = data["location"]
     cur = data["current"]
 
-    # Astronomy API for sunrise/sunset
-    astro_url = f"{WEATHER_BASE}/astronomy.json?key={WEATHER_API_KEY}&q={lat},{lon}"
-    async with httpx.AsyncClient() as client:
-        astro_res = await client.get(astro_url)
-
-    astro = astro_res.json()["astronomy"]["astro"]
+    astro = data["forecast"]["forecastday"][0]["astro"]
 
-    return CurrentWeatherOut(
+    # Trusted upstream fields - skip Pydantic validation
+    out = CurrentWeatherOut.model_construct(
         location=loc["name"],
         coordinates={"lat": lat, "lon": lon},
         temperature=cur["temp_c"],
@@ -159,6 +196,8 @@ async def get_current_weather(lat: float, lon: float):
         sunset=astro["sunset"],
         lastUpdated=cur["last_updated"]
     )
+    _current_cache[cache_key] = out
+    return out
 
 
 @app.get("/api/weather/forecast", response_model=ForecastOut)
@@ -166,38 +205,42 @@ async def get_forecast(lat: float, lon: float, days: int = Query(7, ge=1, le=14)
     """
     Weather forecast from WeatherAPI (max 14 days).
     """
-    url = f"{WEATHER_BASE}/forecast.json?key={WEATHER_API_KEY}&q={lat},{lon}&days={days}&aqi=no&alerts=no"
+    cache_key = (round(lat, 2), round(lon, 2), days)
+    if cache_key in _forecast_cache:
+        return _forecast_cache[cache_key]
 
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url)
+    url = f"/forecast.json?key={WEATHER_API_KEY}&q={lat},{lon}&days={days}&aqi=no&alerts=no"
+
+    res = await HTTP_CLIENT.get(url)
 
     if res.status_code != 200:
         raise HTTPException(500, "Forecast API error")
 
-    data = res.json()
+    data = orjson.loads(res.content)
     forecast_days = data["forecast"]["forecastday"]
 
-    output = []
-
     today_str = datetime.now().strftime("%Y-%m-%d")
 
-    for d in forecast_days:
-        day = d["day"]
-        output.append(
-            ForecastDay(
-                date=d["date"],
-                high=day["maxtemp_c"],
-                low=day["mintemp_c"],
-                condition=day["condition"]["text"],
-                rainChance=day.get("daily_chance_of_rain", 0),
-                rainAmount=day.get("totalprecip_mm", 0),
-                humidity=day.get("avghumidity", 0),
-                windSpeed=day.get("maxwind_kph", 0),
-                isToday=(d["date"] == today_str)
-            )
+    # model_construct skips Pydantic validation - these fields come from
+    # WeatherAPI's documented schema, not user input
+    output = [
+        ForecastDay.model_construct(
+            date=d["date"],
+            high=d["day"]["maxtemp_c"],
+            low=d["day"]["mintemp_c"],
+            condition=d["day"]["condition"]["text"],
+            rainChance=d["day"].get("daily_chance_of_rain", 0),
+            rainAmount=d["day"].get("totalprecip_mm", 0),
+            humidity=d["day"].get("avghumidity", 0),
+            windSpeed=d["day"].get("maxwind_kph", 0),
+            isToday=(d["date"] == today_str),
         )
+        for d in forecast_days
+    ]
 
-    return ForecastOut(days=output)
+    out = ForecastOut.model_construct(days=output)
+    _forecast_cache[cache_key] = out
+    return out
 
 
 # ---------------------------------------------------------
@@ -206,35 +249,31 @@ async def get_forecast(lat: float, lon: float, days: int = Query(7, ge=1, le=14)
 
 @app.get("/api/weather/analytics", response_model=AnalyticsOut)
 async def get_analytics(lat: float, lon: float, days: int = Query(7, ge=1, le=14)):
-    url = f"{WEATHER_BASE}/forecast.json?key={WEATHER_API_KEY}&q={lat},{lon}&days={days}"
-
-    async with httpx.AsyncClient() as client:
-        res = await client.get(url)
-
-    data = res.json()["forecast"]["forecastday"]
-
-    temps, rains, hums, winds = [], [], [], []
-
-    extreme_days = 0
-
-    for d in data:
-        day = d["day"]
-        temps.append(day["avgtemp_c"])
-        rains.append(day["totalprecip_mm"])
-        hums.append(day["avghumidity"])
-        winds.append(day["maxwind_kph"])
-
-        # extreme rule example
-        if day["maxtemp_c"] > 40 or day["mintemp_c"] < 5:
-            extreme_days += 1
-
-    return AnalyticsOut(
-        avgTemp=sum(temps) / len(temps),
-        maxTemp=max(temps),
-        minTemp=min(temps),
-        totalRainfall=sum(rains),
-        avgHumidity=sum(hums) / len(hums),
-        avgWindSpeed=sum(winds) / len(winds),
+    url = f"/forecast.json?key={WEATHER_API_KEY}&q={lat},{lon}&days={days}"
+
+    res = await HTTP_CLIENT.get(url)
+
+    data = orjson.loads(res.content)["forecast"]["forecastday"]
+
+    # Vectorized reductions instead of four Python append loops
+    n = len(data)
+    temps = np.fromiter((d["day"]["avgtemp_c"] for d in data), dtype=np.float32, count=n)
+    rains = np.fromiter((d["day"]["totalprecip_mm"] for d in data), dtype=np.float32, count=n)
+    hums = np.fromiter((d["day"]["avghumidity"] for d in data), dtype=np.float32, count=n)
+    winds = np.fromiter((d["day"]["maxwind_kph"] for d in data), dtype=np.float32, count=n)
+    maxt = np.fromiter((d["day"]["maxtemp_c"] for d in data), dtype=np.float32, count=n)
+    mint = np.fromiter((d["day"]["mintemp_c"] for d in data), dtype=np.float32, count=n)
+
+    # extreme rule example
+    extreme_days = int(((maxt > 40) | (mint < 5)).sum())
+
+    return AnalyticsOut.model_construct(
+        avgTemp=float(temps.mean()),
+        maxTemp=float(temps.max()),
+        minTemp=float(temps.min()),
+        totalRainfall=float(rains.sum()),
+        avgHumidity=float(hums.mean()),
+        avgWindSpeed=float(winds.mean()),
         extremeDays=extreme_days
     )
 
@@ -318,7 +357,7 @@ def health():
 # ========== Crop Routes ==========
 
 @app.post("/api/v1/crop/recommend")
-def crop_recommend(req: CropRequest):
+async def crop_recommend(req: CropRequest):
     """
     Recommend suitable crops based on soil type, fertility, and location weather.
     
@@ -330,7 +369,7 @@ def crop_recommend(req: CropRequest):
         "district_name": "Durg"
     }
     """
-    return CropService.recommend_crops(
+    return await CropService.recommend_crops(
         soil_type=req.soil_type,
         soil_quality=req.soil_quality,
         state_name=req.state_name,
@@ -341,7 +380,7 @@ def crop_recommend(req: CropRequest):
 # ========== Irrigation Routes ==========
 
 @app.post("/api/v1/irrigation/recommend")
-def irrigation_recommend(req: IrrigationRequest):
+async def irrigation_recommend(req: IrrigationRequest):
     """
     Recommend irrigation schedule: whether to irrigate and how much water.
     Uses soil feel + forecast rain to decide.
@@ -354,7 +393,7 @@ def irrigation_recommend(req: IrrigationRequest):
         "district_name": "Durg"
     }
     """
-    return recommend_irrigation_with_weather(
+    return await recommend_irrigation_with_weather(
         soil_feel=req.soil_feel,
         application_rate_mm_per_h=req.application_rate,
         state_name=req.state_name,
@@ -365,22 +404,24 @@ def irrigation_recommend(req: IrrigationRequest):
 # ========== Combined Routes ==========
 
 @app.post("/api/v1/combined")
-def combined_recommend(crop_req: CropRequest, irri_req: IrrigationRequest):
+async def combined_recommend(crop_req: CropRequest, irri_req: IrrigationRequest):
     """
     Get both crop AND irrigation recommendation in one call.
     """
-    crop_result = CropService.recommend_crops(
-        soil_type=crop_req.soil_type,
-        soil_quality=crop_req.soil_quality,
-        state_name=crop_req.state_name,
-        district_name=crop_req.district_name,
-    )
-
-    irri_result = recommend_irrigation_with_weather(
-        soil_feel=irri_req.soil_feel,
-        application_rate_mm_per_h=irri_req.application_rate,
-        state_name=irri_req.state_name,
-        district_name=irri_req.district_name,
+    # The two recommendations are independent - run them concurrently
+    crop_result, irri_result = await asyncio.gather(
+        CropService.recommend_crops(
+            soil_type=crop_req.soil_type,
+            soil_quality=crop_req.soil_quality,
+            state_name=crop_req.state_name,
+            district_name=crop_req.district_name,
+        ),
+        recommend_irrigation_with_weather(
+            soil_feel=irri_req.soil_feel,
+            application_rate_mm_per_h=irri_req.application_rate,
+            state_name=irri_req.state_name,
+            district_name=irri_req.district_name,
+        ),
     )
 
     return {
@@ -390,6 +431,18 @@ def combined_recommend(crop_req: CropRequest, irri_req: IrrigationRequest):
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # uvloop event loop + httptools parser (both ship with
+    # uvicorn[standard]); the import string is required for workers > 1
+    uvicorn.run(
+        "main2:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+    )
 
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class CropRequest(BaseModel):
+    soil_type: str        # "Sandy", "Loam", "Clay"
+    soil_quality: str     # "Poor", "Medium", "Rich"
+    state_name: str       # "Chhattisgarh"
+    district_name: str    # "Durg"
@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+
+
+class IrrigationRequest(BaseModel):
+    soil_feel: str        # "Dry and Crumbly", "Slightly Damp", "Wet and Muddy"
+    application_rate: float  # mm/hour
+    state_name: str
+    district_name: str
+    farm_id: str = None
@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class UserProfile(BaseModel):
+    full_name: str
+    email: str
+    phone: str
+    village: str
+    district: str
+    state: str
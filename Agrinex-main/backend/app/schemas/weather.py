@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from typing import Dict, List
+
+
+class CurrentWeatherOut(BaseModel):
+    location: str
+    coordinates: Dict[str, float]
+    temperature: float
+    feelsLike: float
+    condition: str
+    humidity: int
+    windSpeed: float
+    windDirection: int
+    pressure: float
+    visibility: float
+    uvIndex: float
+    precipMm: float  # Current precipitation in mm
+    rainChance: int  # Chance of rain today (%)
+    sunrise: str
+    sunset: str
+    lastUpdated: str
+
+
+class ForecastDay(BaseModel):
+    date: str
+    high: float
+    low: float
+    condition: str
+    rainChance: int
+    rainAmount: float
+    humidity: int
+    windSpeed: float
+    isToday: bool
+
+
+class ForecastOut(BaseModel):
+    days: List[ForecastDay]
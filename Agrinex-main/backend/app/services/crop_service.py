@@ -1,24 +1,60 @@
+import asyncio
 import joblib
 import os
-from typing import Dict
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+from cachetools import TTLCache
 
 from .weather_service import get_openmeteo_weather, map_location_to_coords
 
-# Load pre-trained crop model
+# Path to the pre-trained crop model
 # This file is at: backend/app/services/crop_service.py
 # We need to go up 3 levels to backend/, then into models/
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 CROP_MODEL_PATH = os.path.join(BASE_DIR, "models", "crop_recommender_pipeline.pkl")
-crop_model = joblib.load(CROP_MODEL_PATH)
+
+# Few districts account for most traffic and weather changes hourly at
+# best, so recent recommendations are served straight from memory
+_recommend_cache = TTLCache(maxsize=2048, ttl=3600)
 
 
 class CropService:
+    # Loaded once via load_once() - at app startup, or lazily on first use
+    _model = None
+
+    @classmethod
+    def load_once(cls):
+        """Load the pickled pipeline once and keep it live in memory.
+
+        mmap_mode="r" maps the pickled numpy arrays straight from the
+        page cache instead of copying them, so worker processes share
+        one physical copy of the model's weights.
+        """
+        if cls._model is None:
+            cls._model = joblib.load(CROP_MODEL_PATH, mmap_mode="r")
+        return cls._model
+
     SOIL_QUALITY_MAP = {
         "Poor": {"N": 20, "P": 10, "K": 10},
         "Medium": {"N": 50, "P": 25, "K": 25},
         "Rich": {"N": 90, "P": 40, "K": 40},
     }
 
+    # EXACT training feature names, in order - rows are built as plain
+    # lists against this so no per-request dict is hashed into columns
+    FEATURE_ORDER = [
+        "N_req_kg_per_ha",
+        "P_req_kg_per_ha",
+        "K_req_kg_per_ha",
+        "Temperature_C",
+        "Humidity_%",
+        "pH",
+        "Rainfall_mm",
+        "State Name",
+    ]
+
     SOIL_TYPE_MAP = {
         "Sandy": 6.5,
         "Loam": 7.0,
@@ -32,7 +68,7 @@ class CropService:
 
 
     @staticmethod
-    def recommend_crops(
+    async def recommend_crops(
         soil_type: str,
         soil_quality: str,
         state_name: str,
@@ -41,7 +77,13 @@ class CropService:
         """
         Recommend crops based on soil + location + weather.
         """
+        cache_key = (soil_type, soil_quality, state_name, district_name)
+        if cache_key in _recommend_cache:
+            return _recommend_cache[cache_key]
+
         try:
+            crop_model = CropService.load_once()
+
             # 1. Map soil inputs to numeric values
             npk = CropService.SOIL_QUALITY_MAP.get(
                 soil_quality, CropService.SOIL_QUALITY_MAP["Medium"]
@@ -50,42 +92,37 @@ class CropService:
 
             # 2. Fetch weather from Open-Meteo
             lat, lon = map_location_to_coords(state_name, district_name)
-            weather = get_openmeteo_weather(lat, lon)
+            weather = await get_openmeteo_weather(lat, lon)
             temp = weather["temperature"]
             humidity = weather["humidity"]
             rainfall_mm = max(weather["rain_24h"], 0.0)
 
-            # 3. Build feature dict for model
-            #    Must match training feature names exactly!
-            sample = {
-                "N_req_kg_per_ha": npk["N"],
-                "P_req_kg_per_ha": npk["P"],
-                "K_req_kg_per_ha": npk["K"],
-                "Temperature_C": temp,
-                "Humidity_%": humidity,
-                "pH": ph_val,
-                "Rainfall_mm": rainfall_mm,
-                "State Name": state_name,
-            }
-
-            # 4. Convert dict to DataFrame for pipeline
-            import pandas as pd
-            df_sample = pd.DataFrame([sample])
+            # 3. Build the feature row in FEATURE_ORDER - a positional
+            #    list straight into the frame, no intermediate dict
+            row = [
+                npk["N"], npk["P"], npk["K"],
+                temp, humidity, ph_val, rainfall_mm,
+                state_name,
+            ]
+            df_sample = pd.DataFrame([row], columns=CropService.FEATURE_ORDER)
 
-            # 5. Get predictions
+            # 5. Get predictions - top-5 via argpartition (O(C)) instead
+            # of materializing and sorting a dict per class (O(C log C))
             proba = crop_model.predict_proba(df_sample)
             proba = proba[0]
             classes = crop_model.classes_
 
+            k = min(5, len(proba))
+            idx = np.argpartition(-proba, k - 1)[:k]
+            idx = idx[np.argsort(-proba[idx])]
             crop_probs = [
-                {"crop": cls, "probability": float(p)}
-                for cls, p in zip(classes, proba)
+                {"crop": str(classes[i]), "probability": float(proba[i])}
+                for i in idx
             ]
-            crop_probs.sort(key=lambda x: x["probability"], reverse=True)
 
-            return {
+            result = {
                 "success": True,
-                "recommended_crops": crop_probs[:5],
+                "recommended_crops": crop_probs,
                 "soil_params": {
                     "soil_type": soil_type,
                     "soil_quality": soil_quality,
@@ -98,8 +135,84 @@ class CropService:
                 "state": state_name,
                 "district": district_name,
             }
+            _recommend_cache[cache_key] = result
+            return result
         except Exception as e:
             return {
                 "success": False,
                 "error": f"Crop recommendation failed: {str(e)}",
             }
+
+    @staticmethod
+    async def recommend_crops_batch(requests: List[Dict]) -> List[Dict]:
+        """
+        Recommend crops for N requests with ONE predict_proba call.
+
+        sklearn's per-call Python overhead is fixed, so scoring an N-row
+        DataFrame instead of N one-row frames scales near-linearly.
+        Each item needs soil_type, soil_quality, state_name, district_name.
+        """
+        try:
+            crop_model = CropService.load_once()
+
+            # Fetch weather for all locations concurrently
+            coords = [
+                map_location_to_coords(r["state_name"], r["district_name"])
+                for r in requests
+            ]
+            weathers = await asyncio.gather(
+                *(get_openmeteo_weather(lat, lon) for lat, lon in coords)
+            )
+
+            # One row per request, same feature names as training
+            rows = []
+            soil_params = []
+            for req, weather in zip(requests, weathers):
+                npk = CropService.SOIL_QUALITY_MAP.get(
+                    req["soil_quality"], CropService.SOIL_QUALITY_MAP["Medium"]
+                )
+                ph_val = CropService.SOIL_TYPE_MAP.get(req["soil_type"], 7.0)
+                rows.append([
+                    npk["N"], npk["P"], npk["K"],
+                    weather["temperature"], weather["humidity"],
+                    ph_val, max(weather["rain_24h"], 0.0),
+                    req["state_name"],
+                ])
+                soil_params.append({
+                    "soil_type": req["soil_type"],
+                    "soil_quality": req["soil_quality"],
+                    "N_req_kg_per_ha": npk["N"],
+                    "P_req_kg_per_ha": npk["P"],
+                    "K_req_kg_per_ha": npk["K"],
+                    "pH": ph_val,
+                })
+
+            # Single batched prediction over the N x C probability matrix
+            proba = crop_model.predict_proba(
+                pd.DataFrame(rows, columns=CropService.FEATURE_ORDER)
+            )
+            classes = crop_model.classes_
+            k = min(5, proba.shape[1])
+
+            results = []
+            for i, (req, weather) in enumerate(zip(requests, weathers)):
+                # Top-k without sorting all C classes
+                idx = np.argpartition(-proba[i], k - 1)[:k]
+                idx = idx[np.argsort(-proba[i][idx])]
+                results.append({
+                    "success": True,
+                    "recommended_crops": [
+                        {"crop": str(classes[j]), "probability": float(proba[i][j])}
+                        for j in idx
+                    ],
+                    "soil_params": soil_params[i],
+                    "weather": weather,
+                    "state": req["state_name"],
+                    "district": req["district_name"],
+                })
+            return results
+        except Exception as e:
+            return [{
+                "success": False,
+                "error": f"Crop recommendation failed: {str(e)}",
+            } for _ in requests]
@@ -4,15 +4,29 @@ import os
 from typing import Dict
 import pandas as pd
 
+from cachetools import TTLCache
 
 from .weather_service import get_openmeteo_weather, map_location_to_coords
 
+# Numba is optional: when installed, moisture_to_water_mm compiles to
+# native code (and autovectorizes if ever fed arrays); otherwise the
+# plain Python function is used unchanged
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 # Load pre-trained irrigation model
 # This file is at: backend/app/services/irrigation_service.py
 # We need to go up 3 levels to backend/, then into models/
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 IRRIGATION_MODEL_PATH = os.path.join(BASE_DIR, "models", "irrigation_model_pipeline.pkl")
-irrigation_model = joblib.load(IRRIGATION_MODEL_PATH)
+# mmap_mode="r" lets multiple uvicorn workers share one physical copy of
+# the model's arrays via the page cache instead of each deserializing it
+irrigation_model = joblib.load(IRRIGATION_MODEL_PATH, mmap_mode="r")
 
 
 SOIL_FEEL_MAP = {
@@ -21,7 +35,15 @@ SOIL_FEEL_MAP = {
     "wet and muddy": 0.8,
 }
 
+# Forecasts update hourly at best, so identical requests within the hour
+# can skip both the weather fetch and the model
+_recommend_cache = TTLCache(maxsize=10_000, ttl=3600)
+
+# EXACT column names from training, built once instead of per request
+_IRRI_COLS = ['moisture1', 'moisture2', 'moisture3', 'moisture4', 'moisture0']
+
 
+@njit(cache=True)
 def moisture_to_water_mm(moisture_mean: float) -> float:
     """
     Convert moisture level to irrigation water depth (mm).
@@ -48,17 +70,15 @@ def recommend_irrigation(
         # 1. Map soil feel to moisture (case insensitive)
         m = SOIL_FEEL_MAP.get(soil_feel.lower(), 0.45)
 
-        # 2. Build DataFrame with EXACT column names from training
-        import pandas as pd
-        features_df = pd.DataFrame(
-            [[m, m, m, m, m]], 
-            columns=['moisture1', 'moisture2', 'moisture3', 'moisture4', 'moisture0']
-        )
+        # 2. Build DataFrame with the training column names
+        features_df = pd.DataFrame([[m, m, m, m, m]], columns=_IRRI_COLS)
 
-        # 3. Get model prediction
+        # 3. Get model prediction - a single predict_proba pass; the class
+        # label is just the argmax, so calling predict() as well would run
+        # the whole pipeline a second time for the same answer
         pred_proba = irrigation_model.predict_proba(features_df)
         proba = pred_proba[0] if pred_proba.ndim > 1 else pred_proba
-        pred = irrigation_model.predict(features_df)[0]
+        pred = irrigation_model.classes_[int(np.argmax(proba))]
         p_irrigate = float(proba[1]) if len(proba) > 1 else 0.5
 
         # rest of function stays same...
@@ -96,7 +116,7 @@ def recommend_irrigation(
         }
 
 
-def recommend_irrigation_with_weather(
+async def recommend_irrigation_with_weather(
     soil_feel: str,
     application_rate_mm_per_h: float,
     state_name: str,
@@ -105,10 +125,14 @@ def recommend_irrigation_with_weather(
     """
     High-level function: fetch weather and recommend irrigation.
     """
+    cache_key = (soil_feel, application_rate_mm_per_h, state_name, district_name)
+    if cache_key in _recommend_cache:
+        return _recommend_cache[cache_key]
+
     try:
         # Fetch weather
         lat, lon = map_location_to_coords(state_name, district_name)
-        weather = get_openmeteo_weather(lat, lon)
+        weather = await get_openmeteo_weather(lat, lon)
         rain_24h = weather["rain_24h"]
 
         # Get irrigation recommendation
@@ -121,12 +145,10 @@ def recommend_irrigation_with_weather(
         result["weather"] = weather
         result["state"] = state_name
         result["district"] = district_name
+        # Logging to Appwrite happens at the route layer - only cache
+        # successful recommendations
         if result["success"]:
-            appwrite_service.log_irrigation(
-            user_id="temp_user",  # from auth later
-            farm_id="temp_farm", 
-            log_data=result
-    )
+            _recommend_cache[cache_key] = result
         return result
     except Exception as e:
         return {
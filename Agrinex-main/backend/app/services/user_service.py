@@ -1,17 +1,22 @@
+from functools import lru_cache
+
 from appwrite.client import Client
 from appwrite.services.databases import Databases
 from app.core.config import settings
 
-client = (Client()
-    .set_endpoint(settings.APPWRITE_ENDPOINT)
-    .set_project(settings.APPWRITE_PROJECT_ID)
-    .set_key(settings.APPWRITE_API_KEY)
-)
 
 class UserService:
     def __init__(self):
+        # Client is built on first use, not at import - importing this
+        # module no longer pays for Appwrite setup (or requires valid
+        # credentials) unless a profile call actually happens
+        client = (Client()
+            .set_endpoint(settings.APPWRITE_ENDPOINT)
+            .set_project(settings.APPWRITE_PROJECT_ID)
+            .set_key(settings.APPWRITE_API_KEY)
+        )
         self.databases = Databases(client)
-    
+
     def create_user_profile(self, user_id: str, profile: dict):
         """Save/update user profile"""
         try:
@@ -23,7 +28,7 @@ class UserService:
             )
         except Exception as e:
             print(f"Error creating user profile: {e}")
-    
+
     def get_user_profile(self, user_id: str):
         """Get user profile"""
         try:
@@ -36,4 +41,8 @@ class UserService:
             print(f"Error getting user profile: {e}")
             return None
 
-user_service = UserService()
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def get_user_service() -> UserService:
+    """Lazily build the singleton UserService on first call."""
+    return UserService()
@@ -1,14 +1,56 @@
+import asyncio
 import os
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Tuple
 
 OPENMETEO_URL = "https://api.open-meteo.com/v1/forecast"
 
-def get_openmeteo_weather(lat: float, lon: float) -> Dict:
+# Shared async client - blocking requests.get was tying up a threadpool
+# worker for the whole Open-Meteo round trip on every recommendation
+_client = httpx.AsyncClient(timeout=5.0)
+
+# Weather is valid for minutes, and many requests repeat the same
+# district coords - serve those from memory (~1 km key granularity)
+_weather_cache = TTLCache(maxsize=10_000, ttl=300)
+
+# Single-flight: on a cache miss the first caller owns the fetch and
+# everyone else awaits its future, so a burst of requests for the same
+# coords costs one upstream round trip instead of N
+_inflight: Dict[Tuple[float, float], asyncio.Future] = {}
+
+async def get_openmeteo_weather(lat: float, lon: float) -> Dict:
     """
     Fetch current weather + 24h rain from Open-Meteo (FREE, no API key).
     """
+    cache_key = (round(lat, 2), round(lon, 2))
+    if cache_key in _weather_cache:
+        return _weather_cache[cache_key]
+
+    pending = _inflight.get(cache_key)
+    if pending is not None:
+        return await pending
+
+    fut: asyncio.Future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = fut
+    try:
+        result = await _fetch_openmeteo_weather(cache_key, lat, lon)
+        fut.set_result(result)
+        return result
+    finally:
+        # _fetch never raises, but if this task is cancelled mid-fetch
+        # the waiters must not hang on an unresolved future
+        if not fut.done():
+            fut.cancel()
+        del _inflight[cache_key]
+
+
+async def _fetch_openmeteo_weather(
+    cache_key: Tuple[float, float], lat: float, lon: float
+) -> Dict:
     try:
         params = {
             "latitude": lat,
@@ -17,9 +59,11 @@ def get_openmeteo_weather(lat: float, lon: float) -> Dict:
             "forecast_days": 1,
             "timezone": "auto",
         }
-        r = requests.get(OPENMETEO_URL, params=params, timeout=5)
+        r = await _client.get(OPENMETEO_URL, params=params)
         r.raise_for_status()
-        data = r.json()
+        # orjson decodes the hourly arrays noticeably faster than the
+        # stdlib decoder behind httpx's .json()
+        data = orjson.loads(r.content)
 
         hours = data["hourly"]["time"]
         temps = data["hourly"]["temperature_2m"]
@@ -31,12 +75,14 @@ def get_openmeteo_weather(lat: float, lon: float) -> Dict:
         humidity = hums[-1]
         rain_24h = sum(prec)  # sum of all hourly precipitation
 
-        return {
+        result = {
             "temperature": temperature,
             "humidity": humidity,
             "rain_24h": rain_24h,
             "timestamp": datetime.utcnow().isoformat(),
         }
+        _weather_cache[cache_key] = result
+        return result
     except Exception as e:
         # Fallback defaults
         return {
@@ -48,13 +94,9 @@ def get_openmeteo_weather(lat: float, lon: float) -> Dict:
         }
 
 
-def map_location_to_coords(state: str, district: str) -> Tuple[float, float]:
-    """
-    Hardcoded mapping of Indian state/district to lat/lon.
-    For full coverage, use the Kaggle dataset: 
-    https://www.kaggle.com/datasets/sirpunch/district-level-longitude-latitude-for-india
-    """
-    location_map = {
+# Hoisted to module scope - this table was being rebuilt (~150 tuple keys
+# hashed and inserted) on every single lookup
+_LOCATION_MAP = {
     # Chhattisgarh
     ("chhattisgarh", "durg"): (21.1939, 81.2740),
     ("chhattisgarh", "raipur"): (21.2514, 81.6296),
@@ -240,10 +282,17 @@ def map_location_to_coords(state: str, district: str) -> Tuple[float, float]:
     ("andaman and nicobar islands", "port blair"): (11.7401, 92.7673),
 }
 
-    
+
+# The API surface sees the same few district strings over and over -
+# lru_cache keys on the raw inputs, so repeat lookups skip the
+# strip/lower scans and tuple build entirely
+@lru_cache(maxsize=1024)
+def map_location_to_coords(state: str, district: str) -> Tuple[float, float]:
+    """
+    Hardcoded mapping of Indian state/district to lat/lon.
+    For full coverage, use the Kaggle dataset:
+    https://www.kaggle.com/datasets/sirpunch/district-level-longitude-latitude-for-india
+    """
     key = (state.strip().lower(), district.strip().lower())
-    if key in location_map:
-        return location_map[key]
-    
     # Default: center of India
-    return 20.0, 78.0
+    return _LOCATION_MAP.get(key, (20.0, 78.0))